@@ -0,0 +1,68 @@
+import os
+import pickle
+import re
+import sys
+import tempfile
+
+OXFORD_PDF = "American_Oxford_3000.pdf"  # Make sure this PDF is in the same folder
+OXFORD_CACHE = "oxford_3000.pkl"
+
+# Words of two or more letters; shared with the app's passage tokenizer
+WORD_RE = re.compile(r"[a-z]{2,}")
+
+# -------------------------------
+# Functions
+# -------------------------------
+
+def parse_oxford_pdf(pdf_path):
+    """
+    Parse Oxford 3000 words from the provided PDF
+    """
+    # Imported here so the app only loads PyMuPDF when the cache is missing
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(pdf_path)
+    words = set()
+    add_all = words.update
+    findall = WORD_RE.findall
+
+    for page in doc:
+        # Each entry is (x0, y0, x1, y1, word, block_no, line_no, word_no)
+        for entry in page.get_text("words"):
+            add_all(findall(entry[4].lower()))
+
+    return frozenset(words)
+
+
+def write_cache(words, cache_path=OXFORD_CACHE):
+    """
+    Write the word set to a pickle cache
+    """
+    # Write to a temp file and rename it, so readers never see a partial cache
+    cache_dir = os.path.dirname(os.path.abspath(cache_path))
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(frozenset(words), f, protocol=5)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def build_cache(pdf_path=OXFORD_PDF, cache_path=OXFORD_CACHE):
+    """
+    Parse the PDF once and write the word set to a pickle cache
+    """
+    words = parse_oxford_pdf(pdf_path)
+    write_cache(words, cache_path)
+    return words
+
+
+# -------------------------------
+# Run once, offline:
+#   python build_oxford_cache.py [pdf_path] [cache_path]
+# -------------------------------
+if __name__ == "__main__":
+    words = build_cache(*sys.argv[1:3])
+    print(f"Wrote {len(words)} words")
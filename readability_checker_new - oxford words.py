@@ -1,43 +1,132 @@
 import streamlit as st
 from textstat import textstat
-import fitz  # PyMuPDF
-import re
+import bisect
+import os
+import pickle
+import unicodedata
+import xxhash
+
+from build_oxford_cache import (
+    OXFORD_CACHE, OXFORD_PDF, WORD_RE, parse_oxford_pdf, write_cache
+)
+
+# Hash passage text with 128-bit xxh3 instead of Streamlit's default hasher
+_TEXT_HASH_FUNCS = {str: lambda s: xxhash.xxh3_128_intdigest(s.encode())}
+
+# Lower bounds of each Flesch band, and (level, color, cefr) for each band
+_FLESCH_THRESHOLDS = (30, 50, 65, 80, 90)
+_FLESCH_BANDS = (
+    ("Very Difficult (Postgraduate)", "red", "C2 (Proficient)"),
+    ("Difficult (College)", "tomato", "C1 (Advanced)"),
+    ("Standard (9th–12th grade)", "orange", "B2 (Upper-Intermediate)"),
+    ("Fairly Easy (7th–8th grade)", "yellowgreen", "B1 (Intermediate)"),
+    ("Easy (6th grade)", "lightgreen", "A2 (Elementary)"),
+    ("Very Easy (5th grade)", "green", "A1 (Beginner)"),
+)
+
+# Interpretation tables shown in the "View Interpretation Scales" expander
+_FLESCH_TABLE_MD = """
+| Score Range | Interpretation | Approx. Education Level |
+|-------------|----------------|--------------------------|
+| 90–100 | Very Easy | 5th grade |
+| 80–89 | Easy | 6th grade |
+| 70–79 | Fairly Easy | 7th grade |
+| 60–69 | Standard | 8th–9th grade |
+| 50–59 | Fairly Difficult | 10th–12th grade |
+| 30–49 | Difficult | College |
+| 0–29 | Very Difficult | College graduate |
+"""
+
+_CEFR_TABLE_MD = """
+| CEFR Level | Description | Typical Reader |
+|------------|-------------|----------------|
+| A1 | Beginner | Basic English user |
+| A2 | Elementary | Simple communication |
+| B1 | Intermediate | Everyday language |
+| B2 | Upper-Intermediate | Professional/academic |
+| C1 | Advanced | Complex texts |
+| C2 | Proficient | Expert-level comprehension |
+"""
 
 # -------------------------------
 # Functions
 # -------------------------------
 
-@st.cache_data
-def load_oxford_3000(pdf_path):
+@st.cache_resource(show_spinner=False)
+def load_oxford_3000(pdf_path, cache_path=OXFORD_CACHE):
     """
-    Load Oxford 3000 words from the provided PDF
+    Load Oxford 3000 words from the precomputed cache,
+    falling back to parsing the provided PDF
     """
-    doc = fitz.open(pdf_path)
-    words = set()
+    if os.path.exists(cache_path):
+        try:
+            # No-op for a frozenset; converts caches pickled as a plain set
+            with open(cache_path, "rb") as f:
+                return frozenset(pickle.load(f))
+        except (EOFError, pickle.UnpicklingError):
+            # Truncated or corrupt cache: rebuild it from the PDF below
+            pass
+
+    words = parse_oxford_pdf(pdf_path)
+    try:
+        write_cache(words, cache_path)
+    except OSError:
+        # Read-only deployment: keep the parsed words for this process only
+        pass
+    return words
 
-    for page in doc:
-        text = page.get_text().lower()
-        text = re.sub(r"[^a-z\s]", " ", text)
-        for word in text.split():
-            if len(word) > 1:
-                words.add(word)
 
-    return words
+def fold_to_ascii(text):
+    """
+    Fold accented letters to plain ASCII (e.g. "café" -> "cafe")
+    """
+    if text.isascii():
+        return text
+    # Drop accents left by NFKD; any other non-ASCII char separates words
+    return "".join(
+        c if c.isascii() else ("" if unicodedata.combining(c) else " ")
+        for c in unicodedata.normalize("NFKD", text)
+    )
 
 
+@st.cache_data(max_entries=128, show_spinner=False, hash_funcs=_TEXT_HASH_FUNCS)
 def extract_words(text):
     """
     Extract unique words from user passage
     """
-    text = text.lower()
-    text = re.sub(r"[^a-z\s]", " ", text)
-    return set(text.split())
+    return frozenset(WORD_RE.findall(fold_to_ascii(text).lower()))
+
+
+@st.cache_data(max_entries=128, show_spinner=False, hash_funcs=_TEXT_HASH_FUNCS)
+def compute_text_stats(text):
+    """
+    Compute all textstat metrics of user passage in one cached call
+    """
+    return {
+        "flesch": textstat.flesch_reading_ease(text),
+        "fk_grade": textstat.flesch_kincaid_grade(text),
+        "syllables": textstat.syllable_count(text),
+    }
+
+
+@st.cache_data(max_entries=128, show_spinner=False, hash_funcs=_TEXT_HASH_FUNCS)
+def find_non_oxford_words(text):
+    """
+    Alphabetically sorted passage words outside the Oxford 3000
+    """
+    return sorted(extract_words(text) - oxford_words)
+
+
+def classify_flesch(score):
+    """
+    Map a Flesch score to its (level, color, cefr) band
+    """
+    return _FLESCH_BANDS[bisect.bisect_right(_FLESCH_THRESHOLDS, score)]
 
 
 # -------------------------------
 # Load Oxford 3000
 # -------------------------------
-OXFORD_PDF = "American_Oxford_3000.pdf"  # Make sure this PDF is in the same folder
 oxford_words = load_oxford_3000(OXFORD_PDF)
 
 # -------------------------------
@@ -62,36 +151,28 @@ if st.button("Analyze Passage"):
     if not text.strip():
         st.warning("Please enter a passage to analyze.")
     else:
+        # Reuse the last analysis when the same passage is analyzed again
+        last = st.session_state.get("last_analysis")
+        if last is not None and last[0] == text:
+            stats, passage_words, non_oxford_words = last[1:]
+        else:
+            stats = compute_text_stats(text)
+            passage_words = extract_words(text)
+            non_oxford_words = find_non_oxford_words(text)
+            st.session_state["last_analysis"] = (
+                text, stats, passage_words, non_oxford_words
+            )
+
         # -------------------------------
         # Readability Score
         # -------------------------------
-        flesch_score = textstat.flesch_reading_ease(text)
-
-        if flesch_score >= 90:
-            level, color = "Very Easy (5th grade)", "green"
-            cefr = "A1 (Beginner)"
-        elif flesch_score >= 80:
-            level, color = "Easy (6th grade)", "lightgreen"
-            cefr = "A2 (Elementary)"
-        elif flesch_score >= 65:
-            level, color = "Fairly Easy (7th–8th grade)", "yellowgreen"
-            cefr = "B1 (Intermediate)"
-        elif flesch_score >= 50:
-            level, color = "Standard (9th–12th grade)", "orange"
-            cefr = "B2 (Upper-Intermediate)"
-        elif flesch_score >= 30:
-            level, color = "Difficult (College)", "tomato"
-            cefr = "C1 (Advanced)"
-        else:
-            level, color = "Very Difficult (Postgraduate)", "red"
-            cefr = "C2 (Proficient)"
+        flesch_score = stats["flesch"]
+
+        level, color, cefr = classify_flesch(flesch_score)
 
         # -------------------------------
         # Vocabulary Analysis
         # -------------------------------
-        passage_words = extract_words(text)
-        non_oxford_words = passage_words - oxford_words
-
         total_words = len(passage_words)
         advanced_count = len(non_oxford_words)
         advanced_percentage = (advanced_count / total_words) * 100 if total_words else 0
@@ -116,34 +197,20 @@ if st.button("Analyze Passage"):
         st.write(f"**Vocabulary Percentage:** {advanced_percentage:.2f}%")
 
         with st.expander("View (Non-Oxford) Words Used"):
-            st.write(sorted(non_oxford_words))
+            # Arrow-serialized and virtually scrolled, unlike st.write on a list
+            st.dataframe(
+                {"Word": non_oxford_words},
+                hide_index=True,
+                width="stretch"
+            )
 
         # -------------------------------
         # Interpretation Scales
         # -------------------------------
         with st.expander("📊 View Interpretation Scales"):
             st.markdown("### Interpretation Scale (Flesch Reading Ease)")
-            st.write("""
-| Score Range | Interpretation | Approx. Education Level |
-|-------------|----------------|--------------------------|
-| 90–100 | Very Easy | 5th grade |
-| 80–89 | Easy | 6th grade |
-| 70–79 | Fairly Easy | 7th grade |
-| 60–69 | Standard | 8th–9th grade |
-| 50–59 | Fairly Difficult | 10th–12th grade |
-| 30–49 | Difficult | College |
-| 0–29 | Very Difficult | College graduate |
-            """)
+            st.markdown(_FLESCH_TABLE_MD)
 
             st.markdown("### CEFR Readability Scale")
-            st.write("""
-| CEFR Level | Description | Typical Reader |
-|------------|-------------|----------------|
-| A1 | Beginner | Basic English user |
-| A2 | Elementary | Simple communication |
-| B1 | Intermediate | Everyday language |
-| B2 | Upper-Intermediate | Professional/academic |
-| C1 | Advanced | Complex texts |
-| C2 | Proficient | Expert-level comprehension |
-            """)
+            st.markdown(_CEFR_TABLE_MD)
 